@@ -1,7 +1,6 @@
 from concurrent.futures import ProcessPoolExecutor
 import datetime as dt
-from functools import partial, wraps
-import json
+from functools import lru_cache, partial, wraps
 import logging
 import os
 from pathlib import Path
@@ -10,11 +9,10 @@ import time
 
 
 import click
-from croniter import croniter
-import pytz
 
 
-from goes_viewer import __version__
+from goes_viewer import __version__, fastjson
+from goes_viewer.log_config import basic_logging_config
 
 
 def handle_exception(logger, exc_type, exc_value, exc_traceback):
@@ -25,19 +23,6 @@ def handle_exception(logger, exc_type, exc_value, exc_traceback):
                  exc_info=(exc_type, exc_value, exc_traceback))
 
 
-def basic_logging_config():
-    logging.basicConfig(level=logging.WARNING,
-                        format='%(asctime)s %(levelname)s %(message)s')
-    sentry_dsn = os.getenv('SENTRY_DSN', None)
-    if sentry_dsn is not None:
-        try:
-            import sentry_sdk
-        except ImportError:
-            logging.error('Cannot monitor with sentry')
-        else:
-            sentry_sdk.init(dsn=sentry_dsn, release=f'goes_viewer@{__version__}')
-
-
 sys.excepthook = partial(handle_exception, logging.getLogger())
 basic_logging_config()
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
@@ -73,80 +58,79 @@ verbose = click.option("-v", "--verbose", count=True, help="Increase logging ver
 timeout = click.option(
     "--timeout", show_default=True, default=30, help="Request timeout"
 )
+user = click.option(
+    "-u",
+    "--user",
+    show_envvar=True,
+    help="Username to access API.",
+    envvar="APIUSER",
+    required=True,
+)
+password = click.option(
+    "-p",
+    "--password",
+    show_envvar=True,
+    envvar="APIPASS",
+    required=True,
+    prompt=True,
+    hide_input=True,
+    help="Password to access API",
+)
+passfile = click.option(
+    "--passfile",
+    help="File containing username and password on separate lines. Overrides env variables",  # NOQA
+    callback=set_user_pass,
+    is_eager=True,
+    expose_value=False,
+)
+base_url = click.argument("base_url")
+cron = click.option("--cron", help="Run the script on a cron schedule")
+cron_tz = click.option(
+    "--cron-tz",
+    help="Timezone to use for cron scheduling",
+    show_default=True,
+    default="UTC",
+)
+
+
+def _apply_options(cmd, decs):
+    for dec in reversed(decs):
+        cmd = dec(cmd)
+    return cmd
 
 
 def common_options(cmd):
     """Combine common options into one decorator"""
-
-    def wrapper(f):
-        decs = [
-            verbose,
-            click.option(
-                "-u",
-                "--user",
-                show_envvar=True,
-                help="Username to access API.",
-                envvar="APIUSER",
-                required=True,
-            ),
-            click.option(
-                "-p",
-                "--password",
-                show_envvar=True,
-                envvar="APIPASS",
-                required=True,
-                prompt=True,
-                hide_input=True,
-                help="Password to access API",
-            ),
-            click.option(
-                "--passfile",
-                help="File containing username and password on separate lines. Overrides env variables",  # NOQA
-                callback=set_user_pass,
-                is_eager=True,
-                expose_value=False,
-            ),
-            timeout,
-            click.argument("base_url"),
-        ]
-        for dec in reversed(decs):
-            f = dec(f)
-        return f
-
-    return wrapper(cmd)
+    return _apply_options(
+        cmd, (verbose, user, password, passfile, timeout, base_url))
 
 
 def schedule_options(cmd):
     """Combine scheduling options into one decorator"""
+    return _apply_options(cmd, (cron, cron_tz))
 
-    def wrapper(f):
-        decs = [
-            click.option("--cron", help="Run the script on a cron schedule"),
-            click.option(
-                "--cron-tz",
-                help="Timezone to use for cron scheduling",
-                show_default=True,
-                default="UTC",
-            ),
-        ]
-        for dec in reversed(decs):
-            f = dec(f)
-        return f
 
-    return wrapper(cmd)
+@lru_cache(maxsize=None)
+def _tz(name):
+    import pytz
+
+    return pytz.timezone(name)
 
 
 def _now(tz):
-    return dt.datetime.now(tz=pytz.timezone(tz))
+    return dt.datetime.now(tz=_tz(tz))
 
 
 def run_times(cron, cron_tz):
+    from croniter import croniter
+
     now = _now(cron_tz)
     iter = croniter(cron, now)
     while True:
         next_time = iter.get_next(dt.datetime)
-        if next_time > _now(cron_tz):
-            yield next_time
+        sleep_length = (next_time - _now(cron_tz)).total_seconds()
+        if sleep_length > 0:
+            yield next_time, sleep_length
 
 
 def silent_exit(f):
@@ -166,12 +150,14 @@ def silent_exit(f):
 def run_loop(fnc, *args, cron, cron_tz, **kwargs):
     if cron is None:
         return fnc(*args, **kwargs)
-    for rt in run_times(cron, cron_tz):
-        sleep_length = (rt - _now(cron_tz)).total_seconds()
-        logging.info("Sleeping for %0.1f s to next run time at %s", sleep_length, rt)
-        if sleep_length > 0:
+    # a single worker process is reused for every run so each tick does not
+    # pay for starting a new interpreter, while still keeping the work out
+    # of this long-running process
+    with ProcessPoolExecutor(1) as exc:
+        for rt, sleep_length in run_times(cron, cron_tz):
+            logging.info("Sleeping for %0.1f s to next run time at %s",
+                         sleep_length, rt)
             time.sleep(sleep_length)
-        with ProcessPoolExecutor(1) as exc:
             fut = exc.submit(fnc, *args, **kwargs)
             fut.result()
 
@@ -238,7 +224,7 @@ class JSONParamType(click.ParamType):
     name = "json"
 
     def convert(self, value, param, ctx):
-        return json.loads(value)
+        return fastjson.loads(value)
 
 
 JSON = JSONParamType()
@@ -281,7 +267,7 @@ def initialize(base_url, user, password, timeout, save_directory, filters,
     meta = parse_metadata(base_url, filters, auth=(user, password),
                           params=data_params, timeout=timeout)
     with open(save_directory / "metadata.json", "w") as f:
-        json.dump(meta, f)
+        f.write(fastjson.dumps(meta))
     render_html(save_directory)
 
 
@@ -1,5 +1,15 @@
-import json
 import os
+import tempfile
+
+
+from goes_viewer.fastjson import loads
+
+
+def _pair(env, default):
+    """Parse a comma separated pair of floats from the environment"""
+    low, high = map(float, os.getenv(env, default).split(","))
+    return low, high
+
 
 RED = "#AB0520"
 BLUE = "#0C234B"
@@ -9,16 +19,28 @@ SAVE_BUCKET = os.getenv("GV_SAVE_BUCKET", "")
 CONTRAST = int(os.getenv("GV_CONTRAST", 105))
 TILE_SOURCE = os.getenv("GV_TILE_SOURCE",
                         "https://tiles.stadiamaps.com/tiles/stamen_toner_lite")
-LON_LIMITS = [
-    float(s) for s in os.getenv("GV_LON_LIMITS", "-115,-103").split(",")
-]
-LAT_LIMITS = [float(s) for s in os.getenv("GV_LAT_LIMITS", "31,37").split(",")]
+LON_LIMITS = _pair("GV_LON_LIMITS", "-115,-103")
+LAT_LIMITS = _pair("GV_LAT_LIMITS", "31,37")
 FILENAME = os.getenv("GV_FILE_NAME", "index.html")
-FILTERS = json.loads(os.getenv("GV_FILTERS", '{"Type": "ghi"}'))
+FILTERS = loads(os.getenv("GV_FILTERS", '{"Type": "ghi"}'))
 FIG_DIR = os.getenv('GV_FIG_DIR', 'figs/')
-PLAY_SPEED = os.getenv("GV_PLAY_SPEED", 300)
-PLAY_SPEED_INCR = os.getenv("GV_PLAY_SPEED_INCR", 100)
-RESTART_PAUSE = os.getenv('GV_RESTART_PAUSE', 1000)
-MAX_IMAGES = os.getenv("GV_MAX_IMAGES", 48)
-DATA_PARAMS = json.loads(os.getenv("GV_DATA_PARAMS", '{}'))
+PLAY_SPEED = int(os.getenv("GV_PLAY_SPEED", 300))
+PLAY_SPEED_INCR = int(os.getenv("GV_PLAY_SPEED_INCR", 100))
+RESTART_PAUSE = int(os.getenv('GV_RESTART_PAUSE', 1000))
+MAX_IMAGES = int(os.getenv("GV_MAX_IMAGES", 48))
+# ms between requests for the list of images
+POLLING_INTERVAL = int(os.getenv("GV_POLLING_INTERVAL", 10000))
+DATA_PARAMS = loads(os.getenv("GV_DATA_PARAMS", '{}'))
 SERVICE_AREA = os.getenv('GV_SERVICE_AREA', None)
+CACHE_DIR = os.getenv("GV_CACHE_DIR", tempfile.gettempdir())
+PROCESS_WORKERS = int(os.getenv("GV_PROCESS_WORKERS", os.cpu_count() or 1))
+if PROCESS_WORKERS < 1:
+    raise ValueError(
+        f"GV_PROCESS_WORKERS must be at least 1, not {PROCESS_WORKERS}")
+# zlib level (0-9) for saved images; low levels are much faster to write
+PNG_COMPRESS_LEVEL = int(os.getenv("GV_PNG_COMPRESS_LEVEL", 1))
+# png, or webp for smaller, faster to write lossy images
+IMAGE_FORMAT = os.getenv("GV_IMAGE_FORMAT", "png").lower()
+if IMAGE_FORMAT not in ("png", "webp"):
+    raise ValueError(
+        f"GV_IMAGE_FORMAT must be png or webp, not {IMAGE_FORMAT}")
@@ -1,10 +1,21 @@
 import numpy as np
-from pyproj import CRS
+from pyproj import CRS, Transformer
 
 
 G17_CORNERS = np.array(((-116, 38), (-102, 30)))
 G16_CORNERS = np.array(((-116, 30), (-102, 38)))
+# sorted lon/lat extent of the G17_CORNERS box that images are resampled to
+IMAGE_LONS = tuple(sorted(G17_CORNERS[:, 0].astype(float).tolist()))
+IMAGE_LATS = tuple(sorted(G17_CORNERS[:, 1].astype(float).tolist()))
 WEB_MERCATOR = CRS.from_epsg("3857")
 GEODETIC = CRS.from_epsg("4326")
+GEO_TO_WEB_MERCATOR = Transformer.from_crs(
+    WEB_MERCATOR.geodetic_crs, WEB_MERCATOR, always_xy=True
+)
+# web mercator (xmin, ymin, xmax, ymax) of the area images are resampled to
+IMAGE_WEBM_EXTENT = tuple(
+    np.array(GEO_TO_WEB_MERCATOR.transform(IMAGE_LONS, IMAGE_LATS))
+    .T.ravel().tolist()
+)
 DX = 2000
 DY = DX
@@ -0,0 +1,22 @@
+"""
+JSON encoding and decoding that uses orjson when it is available and
+falls back to the standard library json module otherwise.
+"""
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    import json
+
+    def loads(value):
+        return json.loads(value)
+
+    def dumps(obj):
+        return json.dumps(obj)
+
+else:
+
+    def loads(value):
+        return orjson.loads(value)
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
@@ -15,28 +15,26 @@ from bokeh.resources import CDN
 from bokeh.embed import file_html
 from bokeh.io import curdoc
 from jinja2 import Environment, PackageLoader
-from pyproj import transform
 
 from goes_viewer import config, areas
-from goes_viewer.constants import WEB_MERCATOR, G17_CORNERS, DX, DY
+from goes_viewer.constants import (
+    GEO_TO_WEB_MERCATOR,
+    IMAGE_LONS,
+    IMAGE_LATS,
+    DX,
+    DY,
+)
 
 
-def compute_image_locations_ranges(corners, range_lon_limits,
+def compute_image_locations_ranges(lons, lats, range_lon_limits,
                                    range_lat_limits):
-    xn, yn = transform(
-        WEB_MERCATOR.geodetic_crs,
-        WEB_MERCATOR,
-        sorted(corners[:, 0]),
-        sorted(corners[:, 1]),
-        always_xy=True,
-    )
-    x_range, y_range = transform(
-        WEB_MERCATOR.geodetic_crs,
-        WEB_MERCATOR,
-        range_lon_limits,
-        range_lat_limits,
-        always_xy=True,
+    # transform the sorted image bounds and the plot ranges in one call
+    xs, ys = GEO_TO_WEB_MERCATOR.transform(
+        tuple(lons) + tuple(range_lon_limits),
+        tuple(lats) + tuple(range_lat_limits),
     )
+    xn, x_range = xs[:2], xs[2:]
+    yn, y_range = ys[:2], ys[2:]
     y = yn[-1] - DY / 2
     x = xn[0] - DX / 2
     w = xn[-1] - xn[0]
@@ -58,8 +56,173 @@ STAMEN_TONER = WMTSTileSource(
 )
 
 
+def _compact_js(code):
+    """
+    Strip indentation, blank lines and whole-line comments from a CustomJS
+    body. Line breaks are kept since the code relies on them to end
+    statements.
+    """
+    lines = (line.strip() for line in code.splitlines())
+    return "\n".join(
+        line for line in lines if line and not line.startswith("//"))
+
+
+_URL_ADAPTER_JS = _compact_js("""
+    const result = {url: []}
+    const urls = cb_data.response
+    var pnglen = 0
+    var len = urls.length
+    var start = 0
+    if (len > max_images) {
+        start = len - max_images
+    }
+    for (i=start; i<len; i++) {
+        var name = urls[i]['name'];
+        if (name.endsWith(image_ext)) {
+            result.url.push(base_url + name)
+            pnglen += 1
+        }
+    }
+    slider.end = Math.max(pnglen - 1, 1)
+    var lasturl = result.url[pnglen - 1]
+    cb_obj.tags = [lasturl]
+    // first run
+    if (fig_source.data['url'].length == 0) {
+        fig_source.data['url'][0] = lasturl
+        fig_source.tags = ['']
+        fig_source.change.emit()
+        slider.value = slider.end
+    }
+    slider.change.emit()
+    return result
+""")
+
+_POINT_ADAPTER_JS = _compact_js("""
+    const result = {x: [], y: [], name: [], capacity: [], value: [], time: [], units: []}
+    const pts = cb_data.response
+    for (i=0; i<pts.length; i++) {
+        result.x.push(pts[i]['x'])
+        result.y.push(pts[i]['y'])
+        result.name.push(pts[i]['name'])
+        result.capacity.push(pts[i]['capacity'])
+        result.units.push(pts[i]['units'])
+        result.time.push(pts[i]['last_time'])
+        result.value.push(pts[i]['last_value'])
+    }
+    return result
+""")
+
+_SLIDER_JS = _compact_js("""
+    if ('url' in url_source.data && cb_obj.value < url_source.data['url'].length){
+        var inp_url = url_source.data['url'][cb_obj.value];
+        // only reload the image when it is actually a different one
+        if (inp_url != fig_source.data['url'][0]) {
+            fig_source.data['url'][0] = inp_url;
+            fig_source.tags = [inp_url];
+            fig_source.change.emit();
+        }
+    }
+    if (cb_obj.value == cb_obj.end) {
+        cb_obj.tags = [1]
+    } else {
+        cb_obj.tags = [0]
+    }
+""")
+
+_NEWEST_JS = _compact_js("""
+    if (slider.tags[0] == 1){
+        if (slider.value != slider.end) {
+            slider.value = slider.end
+            slider.change.emit()
+        }
+        fig_source.data['url'][0] = cb_obj.tags[0]
+        fig_source.tags = [cb_obj.tags[0]];
+        fig_source.change.emit();
+    }
+""")
+
+_TITLE_JS = _compact_js("""
+    var url = cb_obj.data['url'][0]
+    var date = new Date(url.split('/').pop().split('_').pop().split('.')[0])
+    title.text = base_title + date
+    title.change.emit()
+""")
+
+_FASTER_JS = _compact_js("""
+    var old = speed_source.data['speed'][0]
+    var newspeed = old - speed_incr
+    if (newspeed > 0){
+        speed_source.data = {"speed": [newspeed]}
+        speed_source.change.emit()
+    }
+""")
+
+_SLOWER_JS = _compact_js("""
+    var old = speed_source.data['speed'][0]
+    var newspeed = old + speed_incr
+    speed_source.data = {"speed": [newspeed]}
+    speed_source.change.emit()
+""")
+
+_CHANGE_SPEED_JS = _compact_js("""
+    // playback reads the speed every frame, so just restart the wait
+    if (play_buttons.active == 0){
+        play_buttons._last = performance.now()
+    }
+""")
+
+_PLAY_JS = _compact_js("""
+    function stop() {
+        cancelAnimationFrame(cb_obj._raf)
+        cb_obj._raf = null
+        cb_obj.active = 1
+    }
+
+    var timeoutSet = false;
+    function fromstart(){
+        timeoutSet = false
+        if (cb_obj.active == 0){
+            slider.value = 0
+            slider.change.emit()
+        }
+    }
+    function advance(now) {
+        if (cb_obj.active != 0) {
+            return
+        }
+        if (now - cb_obj._last >= speed_source.data['speed'][0]) {
+            cb_obj._last = now
+            if (slider.value < slider.end) {
+                slider.value += 1
+                slider.change.emit()
+            } else if (!timeoutSet){
+                setTimeout(fromstart, pause)
+                timeoutSet = true;
+            }
+        }
+        cb_obj._raf = requestAnimationFrame(advance)
+    }
+
+    function start() {
+        cancelAnimationFrame(cb_obj._raf)
+        cb_obj._last = performance.now()
+        cb_obj._raf = requestAnimationFrame(advance)
+    }
+    if (cb_obj.active == 0) {
+        start()
+    } else if (cb_obj.active == 2) {
+        stop()
+        slider.value = 0
+        slider.change.emit()
+    } else {
+        stop()
+    }
+""")
+
+
 def create_bokeh_figure(
-        corners,
+        lons,
+        lats,
         lon_limits,
         lat_limits,
         base_url="figs/",
@@ -68,7 +231,7 @@ def create_bokeh_figure(
         title="GOES GeoColor Imagery at ",
 ):
     img_args, x_range, y_range, scale = compute_image_locations_ranges(
-        corners, lon_limits, lat_limits)
+        lons, lats, lon_limits, lat_limits)
     map_fig = figure(
         plot_width=int(scale * base_height),
         plot_height=base_height,
@@ -137,57 +300,17 @@ def create_bokeh_figure(
                   fig_source=fig_source,
                   base_url=base_url,
                   title=map_fig.title,
-                  max_images=config.MAX_IMAGES),
-        code="""
-    const result = {url: []}
-    const urls = cb_data.response
-    var pnglen = 0
-    var len = urls.length
-    var start = 0
-    if (len > max_images) {
-        start = len - max_images
-    }
-    for (i=start; i<len; i++) {
-        var name = urls[i]['name'];
-        if (name.endsWith('.png')) {
-            result.url.push(base_url + name)
-            pnglen += 1
-        }
-    }
-    slider.end = Math.max(pnglen - 1, 1)
-    var lasturl = result.url[pnglen - 1]
-    cb_obj.tags = [lasturl]
-    // first run
-    if (fig_source.data['url'].length == 0) {
-        fig_source.data['url'][0] = lasturl
-        fig_source.tags = ['']
-        fig_source.change.emit()
-        slider.value = slider.end
-    }
-    slider.change.emit()
-    return result
-    """,
+                  max_images=config.MAX_IMAGES,
+                  image_ext='.' + config.IMAGE_FORMAT),
+        code=_URL_ADAPTER_JS,
     )
     url_source = AjaxDataSource(data_url=base_url,
-                                polling_interval=10000,
+                                polling_interval=config.POLLING_INTERVAL,
                                 adapter=adapter)
     url_source.method = "GET"
     # url_source.if_modified = True
 
-    pt_adapter = CustomJS(code="""
-    const result = {x: [], y: [], name: [], capacity: [], value: [], time: [], units: []}
-    const pts = cb_data.response
-    for (i=0; i<pts.length; i++) {
-        result.x.push(pts[i]['x'])
-        result.y.push(pts[i]['y'])
-        result.name.push(pts[i]['name'])
-        result.capacity.push(pts[i]['capacity'])
-        result.units.push(pts[i]['units'])
-        result.time.push(pts[i]['last_time'])
-        result.value.push(pts[i]['last_value'])
-    }
-    return result
-""")
+    pt_adapter = CustomJS(code=_POINT_ADAPTER_JS)
 
     pt_source = AjaxDataSource(data_url="metadata.json",
                                polling_interval=int(1e5),
@@ -196,133 +319,31 @@ def create_bokeh_figure(
 
     slider_callback = CustomJS(
         args=dict(fig_source=fig_source, url_source=url_source),
-        code="""
-        if ('url' in url_source.data && cb_obj.value < url_source.data['url'].length){
-            var inp_url = url_source.data['url'][cb_obj.value];
-            fig_source.data['url'][0] = inp_url;
-            fig_source.tags = [inp_url];
-            fig_source.change.emit();
-        }
-        if (cb_obj.value == cb_obj.end) {
-            cb_obj.tags = [1]
-        } else {
-            cb_obj.tags = [0]
-        }
-        """,
+        code=_SLIDER_JS,
     )
 
     newest_callback = CustomJS(args=dict(fig_source=fig_source, slider=slider),
-                               code="""
-        if (slider.tags[0] == 1){
-            if (slider.value != slider.end) {
-                slider.value = slider.end
-                slider.change.emit()
-            }
-            fig_source.data['url'][0] = cb_obj.tags[0]
-            fig_source.tags = [cb_obj.tags[0]];
-            fig_source.change.emit();
-        }
-        """)
+                               code=_NEWEST_JS)
 
     title_callback = CustomJS(
         args=dict(title=map_fig.title, base_title=title),
-        code="""
-        var url = cb_obj.data['url'][0]
-        var date = new Date(url.split('/').pop().split('_').pop().split('.')[0])
-        title.text = base_title + date
-        title.change.emit()
-        """,
+        code=_TITLE_JS,
     )
     faster_callback = CustomJS(
         args=dict(speed_source=speed_source, speed_incr=config.PLAY_SPEED_INCR),
-        code="""
-    var old = speed_source.data['speed'][0]
-    var newspeed = old - speed_incr
-    if (newspeed > 0){
-        speed_source.data = {"speed": [newspeed]}
-        speed_source.change.emit()
-    }
-    """
+        code=_FASTER_JS
     )
     slower_callback = CustomJS(
         args=dict(speed_source=speed_source, speed_incr=config.PLAY_SPEED_INCR),
-        code="""
-    var old = speed_source.data['speed'][0]
-    var newspeed = old + speed_incr
-    speed_source.data = {"speed": [newspeed]}
-    speed_source.change.emit()
-    """
+        code=_SLOWER_JS
     )
     change_speed_callback = CustomJS(
-        args=dict(slider=slider, play_buttons=play_buttons, pause=config.RESTART_PAUSE),
-        code="""
-    var timeoutSet = false;
-    function fromstart(){
-        timeoutSet = false
-        if (play_buttons.active == 0){
-            slider.value = 0
-            slider.change.emit()
-        }
-    }
-    function advance() {
-        if (slider.value < slider.end) {
-            slider.value += 1
-            slider.change.emit()
-        } else if (!timeoutSet){
-            setTimeout(fromstart, pause)
-            timeoutSet = true;
-        }
-    }
-
-    if (play_buttons.active == 0){
-        var id = play_buttons._id
-        clearInterval(id)
-        id = setInterval(advance, cb_obj.data['speed'][0])
-        play_buttons._id = id
-    }
-    """
+        args=dict(play_buttons=play_buttons),
+        code=_CHANGE_SPEED_JS
     )
     play_callback = CustomJS(
         args=dict(slider=slider, speed_source=speed_source, pause=config.RESTART_PAUSE),
-        code="""
-    function stop() {
-        var id = cb_obj._id
-        clearInterval(id)
-        cb_obj.active = 1
-    }
-
-    var timeoutSet = false;
-    function fromstart(){
-        timeoutSet = false
-        if (cb_obj.active == 0){
-            slider.value = 0
-            slider.change.emit()
-        }
-    }
-    function advance() {
-        if (slider.value < slider.end) {
-            slider.value += 1
-            slider.change.emit()
-        } else if (!timeoutSet){
-            setTimeout(fromstart, pause)
-            timeoutSet = true;
-        }
-    }
-
-    function start() {
-        var id = setInterval(advance, speed_source.data['speed'][0])
-        cb_obj._id = id
-    }
-    if (cb_obj.active == 0) {
-        start()
-    } else if (cb_obj.active == 2) {
-        stop()
-        slider.value = 0
-        slider.change.emit()
-    } else {
-        stop()
-    }
-    """,
+        code=_PLAY_JS,
     )
 
     # ajaxdatasource to nginx list of files as json possibly on s3
@@ -334,7 +355,7 @@ def create_bokeh_figure(
                       source=fig_source,
                       **img_args)
     if config.SERVICE_AREA is not None:
-        geo_source = GeoJSONDataSource(geojson=getattr(areas, config.SERVICE_AREA.upper()))
+        geo_source = GeoJSONDataSource(geojson=areas.get_area(config.SERVICE_AREA))
         map_fig.patches(xs='xs',
                         ys='ys',
                         source=geo_source,
@@ -363,7 +384,7 @@ def create_bokeh_figure(
 
 
 def render_html(base_dir):
-    doc = create_bokeh_figure(G17_CORNERS, config.LON_LIMITS,
+    doc = create_bokeh_figure(IMAGE_LONS, IMAGE_LATS, config.LON_LIMITS,
                               config.LAT_LIMITS, config.FIG_DIR)
     env = Environment(loader=PackageLoader("goes_viewer", "templates"))
     template = env.get_template("index.html")
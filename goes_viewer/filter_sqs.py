@@ -2,19 +2,20 @@
 Simple function to filter all SQS messages from noaa-goes notifications
 for the given file prefix.
 """
+from concurrent.futures import ThreadPoolExecutor
 import json
 import boto3
 import os
 
 S3_PREFIX = os.getenv('S3_PREFIX', 'ABI-L2-MCMIPF')
 SQS_URL = os.getenv('SQS_URL', '')
+BATCH_SIZE = 10
+# created once per container so warm invocations skip the boto3 setup
+sqs = boto3.resource('sqs')
 
 
 def lambda_handler(event, context):
-    sqs = boto3.resource('sqs')
-    queue = sqs.Queue(SQS_URL)
-    entries = []
-    i = 1
+    bodies = []
     for erec in event['Records']:
         sns_msg = json.loads(erec['body'])
         rec = json.loads(sns_msg['Message'])
@@ -24,10 +25,19 @@ def lambda_handler(event, context):
             if key.startswith(S3_PREFIX):
                 body = f'{bucket}:{key}'
                 print(f'sending to queue {body}')
-                entries.append({'Id': str(i), 'MessageBody': body})
-                i += 1
+                bodies.append(body)
+    entries = [{'Id': str(i), 'MessageBody': body}
+               for i, body in enumerate(bodies, start=1)]
     if entries:
-        resp = queue.send_messages(Entries=entries)
+        # SQS accepts at most 10 messages per send_messages call
+        batches = [entries[i:i + BATCH_SIZE]
+                   for i in range(0, len(entries), BATCH_SIZE)]
+        # resources are not thread safe, but the low-level client is
+        with ThreadPoolExecutor(max_workers=8) as exc:
+            resp = list(exc.map(
+                lambda batch: sqs.meta.client.send_message_batch(
+                    QueueUrl=SQS_URL, Entries=batch),
+                batches))
     else:
         resp = "None"
     return {
@@ -0,0 +1,18 @@
+import logging
+import os
+
+
+from goes_viewer import __version__
+
+
+def basic_logging_config():
+    logging.basicConfig(level=logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    sentry_dsn = os.getenv('SENTRY_DSN', None)
+    if sentry_dsn is not None:
+        try:
+            import sentry_sdk
+        except ImportError:
+            logging.error('Cannot monitor with sentry')
+        else:
+            sentry_sdk.init(dsn=sentry_dsn, release=f'goes_viewer@{__version__}')
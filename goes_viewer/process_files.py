@@ -1,30 +1,98 @@
 import boto3
+from concurrent.futures import ProcessPoolExecutor
 import cv2 as cv
 import datetime as dt
+import fcntl
+from functools import lru_cache
+import hashlib
 import logging
+import multiprocessing as mp
+import numba
 import numpy as np
 import os
 from pathlib import Path
 from PIL import Image
 from PIL.PngImagePlugin import PngInfo
-from pyproj import CRS, transform
+from pyproj import CRS, Transformer
 import pyresample
 import s3fs
 import tempfile
 import xarray as xr
-
-from goes_viewer.config import CONTRAST, S3_PREFIX
+import zipfile
+
+from goes_viewer import fastjson
+from goes_viewer.config import (
+    CACHE_DIR,
+    CONTRAST,
+    IMAGE_FORMAT,
+    PNG_COMPRESS_LEVEL,
+    PROCESS_WORKERS,
+    S3_PREFIX,
+)
 from goes_viewer.constants import (
     G16_CORNERS,
     G17_CORNERS,
+    IMAGE_WEBM_EXTENT,
     WEB_MERCATOR,
     DX,
     DY,
 )
+from goes_viewer.log_config import basic_logging_config
+
+
+# EXIF ImageDescription, which holds last_modified in webp images
+_EXIF_DESCRIPTION = 0x010E
+# lists the images in a figure directory and the last_modified time of
+# the S3 file each was made from
+MANIFEST = 'manifest.json'
+
+
+@lru_cache(maxsize=None)
+def _geos_crs_and_transformer(proj4_items):
+    """
+    Build the GOES fixed grid CRS described by proj4_items along with a
+    transformer from lon/lat to that grid. Cached since the projection
+    only changes between satellites.
+    """
+    crs = CRS.from_dict(dict(proj4_items))
+    return crs, Transformer.from_crs(crs.geodetic_crs, crs, always_xy=True)
+
+
+def _bounds_slice(coord, low, high):
+    """
+    Slice selecting the values of the monotonic array coord that are
+    within [low, high]. GOES x increases and y decreases along the grid.
+    """
+    if coord[0] > coord[-1]:
+        rev = coord[::-1]
+        start = len(coord) - np.searchsorted(rev, high, side="right")
+        stop = len(coord) - np.searchsorted(rev, low, side="left")
+    else:
+        start = np.searchsorted(coord, low, side="left")
+        stop = np.searchsorted(coord, high, side="right")
+    return slice(int(start), int(stop))
+
+
+# bands and per-band statistics in the MCMIP files that are never read;
+# dropping them up front saves decoding their metadata. Names that are not
+# in a file are ignored.
+_USED_BANDS = (1, 2, 3, 13)
+_UNUSED_VARIABLES = (
+    [f'CMI_C{band:02d}' for band in range(1, 17) if band not in _USED_BANDS]
+    + [f'DQF_C{band:02d}' for band in range(1, 17)]
+    + [f'{stat}_{kind}_C{band:02d}'
+       for band in range(1, 17)
+       for kind in ('reflectance_factor', 'brightness_temperature')
+       for stat in ('min', 'max', 'mean', 'std_dev')
+       if not (band == 13 and stat == 'max'
+               and kind == 'brightness_temperature')]
+    + [f'outlier_pixel_count_C{band:02d}' for band in range(1, 17)]
+)
 
 
 def open_file(path, corners, engine='h5netcdf'):
-    ds = xr.open_dataset(path, engine=engine)
+    ds = xr.open_dataset(path, engine=engine,
+                         drop_variables=_UNUSED_VARIABLES)
     proj_info = ds.goes_imager_projection
     proj4_params = {
         "ellps": "WGS84",
@@ -40,88 +108,194 @@ def open_file(path, corners, engine='h5netcdf'):
         "units": "m",
         "sweep": proj_info.sweep_angle_axis,
     }
-    crs = CRS.from_dict(proj4_params)
-    bnds = transform(crs.geodetic_crs, crs, corners[:, 0], corners[:, 1])
-    ds = ds.update(
-        {
-            "x": ds.x * proj_info.perspective_point_height,
-            "y": ds.y * proj_info.perspective_point_height,
-        }
-    ).assign_attrs(crs=crs, proj4_params=proj4_params)
-
-    xarg = np.nonzero(((ds.x >= bnds[0].min()) & (ds.x <= bnds[0].max())).values)[0]
-    yarg = np.nonzero(((ds.y >= bnds[1].min()) & (ds.y <= bnds[1].max())).values)[0]
-    return ds.isel(x=xarg, y=yarg)
+    crs, to_geos = _geos_crs_and_transformer(
+        tuple(sorted(proj4_params.items())))
+    bnds = to_geos.transform(corners[:, 0], corners[:, 1])
+    # scan angle to meters, only keeping the part of the grid that is used
+    h = proj_info.perspective_point_height.item()
+    x = ds.x.values * h
+    y = ds.y.values * h
+    xslice = _bounds_slice(x, bnds[0].min(), bnds[0].max())
+    yslice = _bounds_slice(y, bnds[1].min(), bnds[1].max())
+    ds = ds.isel(x=xslice, y=yslice).assign_coords(
+        x=x[xslice], y=y[yslice]).assign_attrs(
+            crs=crs, proj4_params=proj4_params)
+    # the scaled int16 bands decode to float64; float32 is plenty for an
+    # 8-bit image and halves the memory moved through the rest of the steps
+    for band in _USED_BANDS:
+        var = f'CMI_C{band:02d}'
+        ds[var] = ds[var].astype(np.float32)
+    return ds
+
+
+# fastmath without the no-NaN/no-inf assumptions so missing pixels are
+# still detected and passed through as NaN
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@numba.njit(fastmath=_FASTMATH, cache=True)
+def _clip01(x):
+    # NaN fails both comparisons and is passed through, like np.clip
+    if x < 0.0:
+        return 0.0
+    if x > 1.0:
+        return 1.0
+    return x
+
+
+@numba.njit(fastmath=_FASTMATH, cache=True)
+def _maximum(a, b):
+    # NaN in either argument propagates, like np.maximum
+    if np.isnan(a) or np.isnan(b):
+        return np.nan
+    return max(a, b)
+
+
+# x ** (1 / 1.7) sampled on [0, 1]; the result ends up as 8-bit colour so a
+# 16-bit table is plenty and avoids a pow per channel and pixel
+_GAMMA_LUT = np.linspace(0, 1, 2**16, dtype=np.float32) ** np.float32(1 / 1.7)
+
+
+@numba.njit(fastmath=_FASTMATH, cache=True)
+def _gamma(x, lut):
+    if np.isnan(x):
+        return x
+    return lut[int(x * (lut.size - 1) + 0.5)]
+
+
+@numba.njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def _geocolor_kernel(R, NIR, B, IR, ir_lo, ir_hi, F, gamma_lut, out):
+    ir_scale = 1.0 / (ir_hi - ir_lo)
+    for i in numba.prange(R.shape[0]):
+        for j in range(R.shape[1]):
+            # Apply range limits for each channel. RGB values must be
+            # between 0 and 1
+            r = _clip01(R[i, j])
+            nir = _clip01(NIR[i, j])
+            b = _clip01(B[i, j])
+
+            # Calculate the "True" Green
+            g = _clip01(0.45 * r + 0.1 * nir + 0.45 * b)
+
+            # Apply the gamma correction
+            r = _gamma(r, gamma_lut)
+            g = _gamma(g, gamma_lut)
+            b = _gamma(b, gamma_lut)
+
+            ir = _clip01((IR[i, j] - ir_lo) * ir_scale)
+            # Lessen the brightness of the coldest clouds so they don't
+            # appear so bright when we overlay it on the true color image.
+            ir = (1 - ir) / 1.3
+
+            # Maximize the RGB values between the True Color Image and
+            # Clean IR image, then apply the contrast adjustment
+            out[i, j, 0] = _clip01(F * (_maximum(r, ir) - 0.5) + 0.5)
+            out[i, j, 1] = _clip01(F * (_maximum(g, ir) - 0.5) + 0.5)
+            out[i, j, 2] = _clip01(F * (_maximum(b, ir) - 0.5) + 0.5)
 
 
 def make_geocolor_image(ds):
     """
     Uses simple fractional combination with gamma correction as described in
     https://doi.org/10.1029/2018EA000379
+
+    All of the per-pixel operations are done in a single pass by
+    _geocolor_kernel.
     """
-    # Load the three channels into appropriate R, G, and B
-    R = ds["CMI_C02"].data
-    NIR = ds["CMI_C03"].data
-    B = ds["CMI_C01"].data
-
-    # Apply range limits for each channel. RGB values must be between 0 and 1
-    R = np.clip(R, 0, 1)
-    NIR = np.clip(NIR, 0, 1)
-    B = np.clip(B, 0, 1)
-
-    # Calculate the "True" Green
-    G = 0.45 * R + 0.1 * NIR + 0.45 * B
-    G = np.clip(G, 0, 1)
-
-    # Apply the gamma correction
-    gamma = 1 / 1.7
-    R = np.power(R, gamma)
-    G = np.power(G, gamma)
-    B = np.power(B, gamma)
-
-    cleanIR = ds["CMI_C13"].data
+    # Load the three channels into appropriate R, G, and B. Contiguous
+    # float32 keeps the memory traffic down and always matches the one
+    # compiled (and cached) specialization of the kernel
+    R = np.ascontiguousarray(ds["CMI_C02"].data, dtype=np.float32)
+    NIR = np.ascontiguousarray(ds["CMI_C03"].data, dtype=np.float32)
+    B = np.ascontiguousarray(ds["CMI_C01"].data, dtype=np.float32)
+    cleanIR = np.ascontiguousarray(ds["CMI_C13"].data, dtype=np.float32)
     ir_range = ds.max_brightness_temperature_C13.valid_range
 
-    cleanIR = (cleanIR - ir_range[0]) / (ir_range[1] - ir_range[0])
-    cleanIR = np.clip(cleanIR, 0, 1)
-    cleanIR = 1 - cleanIR
+    F = (259 * (CONTRAST + 255)) / (255.0 * 259 - CONTRAST)
+    out = np.empty(R.shape + (3,), dtype=np.float32)
+    _geocolor_kernel(R, NIR, B, cleanIR, float(ir_range[0]),
+                     float(ir_range[1]), F, _GAMMA_LUT, out)
+    return out
 
-    # Lessen the brightness of the coldest clouds so they don't appear so bright
-    # when we overlay it on the true color image.
-    cleanIR = cleanIR / 1.3
 
-    # Maximize the RGB values between the True Color Image and Clean IR image
-    RGB_ColorIR = np.dstack(
-        [np.maximum(R, cleanIR), np.maximum(G, cleanIR), np.maximum(B, cleanIR)]
+def make_resample_params(ds):
+    """
+    Bilinear resampling parameters, as (neighbour index, weights) arrays,
+    and the output shape for going from the GOES grid of ds to the web
+    mercator area IMAGE_WEBM_EXTENT. These only depend on the grid
+    geometry, so they are cached in memory and on disk in CACHE_DIR and
+    reused for every image from the same satellite and sector.
+    """
+    area_extent = (
+        ds.x.min().item(),
+        ds.y.min().item(),
+        ds.x.max().item(),
+        ds.y.max().item(),
+    )
+    return _cached_resample_params(
+        ds.platform_ID,
+        tuple(sorted(ds.proj4_params.items())),
+        len(ds.x),
+        len(ds.y),
+        area_extent,
     )
 
-    F = (259 * (CONTRAST + 255)) / (255.0 * 259 - CONTRAST)
-    out = F * (RGB_ColorIR - 0.5) + 0.5
-    out = np.clip(out, 0, 1)  # Force value limits 0 through 1.
-    return out
+
+@lru_cache(maxsize=4)
+def _cached_resample_params(platform_id, proj4_items, width, height,
+                            area_extent):
+    key = repr((platform_id, proj4_items, width, height, area_extent,
+                IMAGE_WEBM_EXTENT))
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    path = Path(CACHE_DIR) / f'bil_{platform_id}_{digest}.npz'
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            shape = tuple(cached['shape'].tolist())
+            params = (np.ascontiguousarray(cached['index'], dtype=np.int64),
+                      np.ascontiguousarray(cached['weights'],
+                                           dtype=np.float32))
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        logging.info('Computing resample parameters for %s', platform_id)
+    else:
+        logging.debug('Loaded resample parameters from %s', path)
+        return params, shape
+
+    bil_info, shape = _compute_resample_params(
+        platform_id, dict(proj4_items), width, height, area_extent)
+    params = _bilinear_index_weights(bil_info, width * height)
+    _save_resample_params(path, params, shape)
+    return params, shape
+
+
+def _bilinear_index_weights(bil_info, source_size):
+    """
+    Convert the output of get_bil_info into the flat source index of the
+    four neighbours of each output pixel, shape (N, 4), and their bilinear
+    weights, weighted the same way as get_sample_from_bil_info.
+    """
+    t, s, input_idxs, idx_arr = bil_info
+    index = np.arange(source_size)[input_idxs][idx_arr]
+    weights = np.stack(
+        [(1 - s) * (1 - t), s * (1 - t), (1 - s) * t, s * t], axis=1)
+    # C ordered, like the warm up, so only one kernel specialisation is used
+    return (np.ascontiguousarray(index, dtype=np.int64),
+            np.ascontiguousarray(weights, dtype=np.float32))
 
 
-def make_resample_params(ds, corners):
-    # can be saved for later use to save time
+def _compute_resample_params(platform_id, proj4_params, width, height,
+                             area_extent):
     goes_area = pyresample.AreaDefinition(
-        ds.platform_ID,
+        platform_id,
         "goes area",
         "goes-r",
-        projection=ds.proj4_params,
-        width=len(ds.x),
-        height=len(ds.y),
-        area_extent=(
-            ds.x.min().item(),
-            ds.y.min().item(),
-            ds.x.max().item(),
-            ds.y.max().item(),
-        ),
-    )
-    pts = transform(
-        ds.crs.geodetic_crs, WEB_MERCATOR, sorted(corners[:, 0]), sorted(corners[:, 1])
+        projection=proj4_params,
+        width=width,
+        height=height,
+        area_extent=area_extent,
     )
-    width = int((pts[0][1] - pts[0][0]) / DX)
-    height = int((pts[1][1] - pts[1][0]) / DY)
+    xmin, ymin, xmax, ymax = IMAGE_WEBM_EXTENT
+    width = int((xmax - xmin) / DX)
+    height = int((ymax - ymin) / DY)
     webm_area = pyresample.AreaDefinition(
         "webm",
         "web  mercator",
@@ -129,7 +303,7 @@ def make_resample_params(ds, corners):
         projection=WEB_MERCATOR.to_proj4(),
         width=width,
         height=height,
-        area_extent=(pts[0][0], pts[1][0], pts[0][1], pts[1][1]),
+        area_extent=IMAGE_WEBM_EXTENT,
     )
     shape = (height, width)
     return (
@@ -138,17 +312,73 @@ def make_resample_params(ds, corners):
     )
 
 
+def _save_resample_params(path, params, shape):
+    # make tempfile then move so other processes never read a partial file
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmpfile = tempfile.mkstemp(dir=path.parent, prefix='zzztmp',
+                                       suffix='.npz')
+    except OSError:
+        logging.warning('Unable to cache resample parameters in %s',
+                        path.parent)
+        return
+    tmp = Path(tmpfile)
+    try:
+        with os.fdopen(fd, mode='wb') as f:
+            np.savez(f, shape=np.array(shape), index=params[0],
+                     weights=params[1])
+    except Exception:
+        tmp.unlink()
+        logging.exception('Failed to cache resample parameters')
+    else:
+        tmp.rename(path)
+
+
+@numba.njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def _bilinear_kernel(src, index, weights, out):
+    for p in numba.prange(index.shape[0]):
+        for c in range(src.shape[1]):
+            v = 0.0
+            for k in range(index.shape[1]):
+                v += weights[p, k] * src[index[p, k], c]
+            # pixels off the disk or without data are black
+            if not np.isfinite(v):
+                v = 0.0
+            out[p, c] = np.uint8(v * 255)
+        # and opaque
+        out[p, out.shape[1] - 1] = 255
+
+
 def resample_image(resample_params, shape, img_arr):
-    out = np.dstack(
-        [
-            pyresample.bilinear.get_sample_from_bil_info(
-                img_arr[..., i].reshape(-1), *resample_params, shape
-            )
-            for i in range(3)
-        ]
-        + [np.ones(shape)]
-    )
-    return (np.ma.fix_invalid(out).filled(0) * 255).astype("uint8")
+    # combine the four neighbours of every output pixel for all channels
+    # with the precomputed bilinear weights, writing the RGBA image directly
+    index, weights = resample_params
+    flat = np.ascontiguousarray(img_arr.reshape(-1, img_arr.shape[-1]),
+                                dtype=np.float32)
+    out = np.empty(shape + (4,), dtype="uint8")
+    _bilinear_kernel(flat, index, weights, out.reshape(-1, 4))
+    return out
+
+
+def _warm_up():
+    """
+    Run the numba kernels on a tiny synthetic image, through the same
+    functions as real files, so they are compiled into the on-disk cache
+    """
+    shape = (2, 2)
+    ds = xr.Dataset({
+        band: (("y", "x"), np.full(shape, 0.5, dtype=np.float32))
+        for band in ("CMI_C01", "CMI_C02", "CMI_C03")
+    })
+    ds["CMI_C13"] = (("y", "x"), np.full(shape, 250, dtype=np.float32))
+    ds["max_brightness_temperature_C13"] = xr.DataArray(
+        np.float32(300),
+        attrs={"valid_range": np.array([150, 350], dtype=np.float32)})
+    img = make_geocolor_image(ds)
+    # one output pixel between the four input pixels
+    bil_info = (np.array([0.5]), np.array([0.5]), np.ones(4, dtype=bool),
+                np.array([[0, 1, 2, 3]]))
+    resample_image(_bilinear_index_weights(bil_info, 4), (1, 1), img)
 
 
 def post_processing(image, kernel_size=(9,9), sigma=1.0, amount=1.25, threshold=0,
@@ -165,19 +395,19 @@ def post_processing(image, kernel_size=(9,9), sigma=1.0, amount=1.25, threshold=
     brightened = cv.addWeighted(image, contrast, image, 0, brightness)
     # Use an unsharp mask with gaussian blurring
     blurred = cv.GaussianBlur(brightened, kernel_size, sigma)
-    sharpened = float(amount + 1) * brightened - float(amount) * blurred
-    sharpened = np.maximum(sharpened, np.zeros(sharpened.shape))
-    sharpened = np.minimum(sharpened, 255 * np.ones(sharpened.shape))
-    sharpened = sharpened.round().astype(np.uint8)
+    # addWeighted rounds and saturates to uint8 in a single pass
+    sharpened = cv.addWeighted(brightened, float(amount + 1), blurred,
+                               -float(amount), 0, dtype=cv.CV_8U)
     if threshold > 0:
-        low_contrast_mask = np.absolute(brightened - blurred) < threshold
+        low_contrast_mask = cv.absdiff(brightened, blurred) < threshold
         np.copyto(sharpened, brightened, where=low_contrast_mask)
     return sharpened
 
 
 def make_img_filename(ds):
     date = dt.datetime.utcfromtimestamp(ds.t.item() / 1e9)
-    return f'{ds.platform_ID}_{date.strftime("%Y-%m-%dT%H:%M:%SZ")}.png'
+    return (f'{ds.platform_ID}_{date.strftime("%Y-%m-%dT%H:%M:%SZ")}.'
+            f'{IMAGE_FORMAT}')
 
 
 def save_local(img, filename, fig_dir, last_modified):
@@ -190,14 +420,59 @@ def save_local(img, filename, fig_dir, last_modified):
         metadata.add_text("last_modified", last_modified)
         tmp = Path(tmpfile)
         with open(tmp, mode='wb') as f:
-            Image.fromarray(img).save(f, format="png", optimize=True,
-                                      pnginfo=metadata)
+            if IMAGE_FORMAT == 'webp':
+                exif = Image.Exif()
+                exif[_EXIF_DESCRIPTION] = last_modified
+                # the images are always opaque so the alpha is not needed
+                Image.fromarray(img[..., :3]).save(
+                    f, format="webp", quality=85, exif=exif.tobytes())
+            else:
+                # optimize=True forces zlib level 9 plus extra passes, which
+                # dominated the save time for little size benefit
+                Image.fromarray(img).save(f, format="png", pnginfo=metadata,
+                                          compress_level=PNG_COMPRESS_LEVEL)
     except Exception:
         tmp.unlink()
         raise
     else:
         tmp.chmod(0o644)
         tmp.rename(path)
+    _update_manifest(fig_dir, filename, last_modified)
+
+
+def _update_manifest(fig_dir, filename, last_modified, keep=48):
+    """
+    Record the last_modified time of the S3 file used to make filename in
+    the manifest of fig_dir, keeping only the keep newest images
+    """
+    with open(Path(fig_dir) / MANIFEST, mode='a+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        content = f.read()
+        try:
+            manifest = fastjson.loads(content) if content else None
+        except ValueError:
+            logging.warning('Replacing invalid image manifest')
+            manifest = None
+        if manifest is None:
+            # start from the images already in the directory so they are
+            # not made again
+            manifest = _recently_saved(fig_dir, keep)
+        manifest[filename] = last_modified
+        manifest = {k: manifest[k]
+                    for k in sorted(manifest, key=_image_time)[-keep:]}
+        f.seek(0)
+        f.truncate()
+        f.write(fastjson.dumps(manifest))
+
+
+def _read_manifest(fig_dir):
+    try:
+        with open(Path(fig_dir) / MANIFEST) as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            return fastjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
 
 
 def modify_prefix(base_prefix, prev=False):
@@ -226,30 +501,69 @@ def process_s3_file(bucket, key):
         corners = G17_CORNERS
     else:
         corners = G16_CORNERS
-    remote_file = fs.open(path, mode='rb', fill_cache=True)
+    # HDF5 reads are scattered, so keep recently used 1 MiB blocks around
+    # rather than downloading the whole file up front
+    remote_file = fs.open(path, mode='rb', block_size=2**20,
+                          cache_type='block')
     ds = open_file(remote_file, corners, 'h5netcdf')
     img = make_geocolor_image(ds)
-    resample_params, shape = make_resample_params(ds, G17_CORNERS)
+    resample_params, shape = make_resample_params(ds)
     nimg = resample_image(resample_params, shape, img)
     final_img = post_processing(nimg)
     return final_img, make_img_filename(ds)
 
 
+def _last_page(paginator, bucket_name, prefix):
+    page = {}
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        pass
+    return page
+
+
+def _image_time(filename):
+    # images are named platform_time.ext
+    return filename.split('_', 1)[-1]
+
+
+def _recently_saved(fig_dir, count=24):
+    """
+    The last_modified values stored in the count most recent images, by
+    filename
+    """
+    names = sorted((entry.name for entry in os.scandir(fig_dir)
+                    if entry.name.endswith(('.png', '.webp'))),
+                   key=_image_time)
+    seen = {}
+    for name in names[-count:]:
+        with Image.open(os.path.join(fig_dir, name)) as img:
+            if name.endswith('.png'):
+                seen[name] = img.text.get('last_modified')
+            else:
+                seen[name] = img.getexif().get(_EXIF_DESCRIPTION)
+    return seen
+
+
 def check_and_save_recent_files(bucket_name, prefix, fig_dir):
     logging.debug("=== Starting run ===")
     s3 = boto3.client('s3')
-    paginator = s3.get_paginator("list_objects")
+    paginator = s3.get_paginator("list_objects_v2")
     full_prefix = modify_prefix(prefix)
-    page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=full_prefix)
-    page = [x for x in page_iterator][-1]
+    page = _last_page(paginator, bucket_name, full_prefix)
     while 'Contents' not in page.keys():
         full_prefix = modify_prefix(prefix, prev=True)
         logging.debug(f"No files created in bucket yet, checking previous folder: {full_prefix}")
-        page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=full_prefix)
-        page = [x for x in page_iterator][-1]
-
+        page = _last_page(paginator, bucket_name, full_prefix)
+
+    # Check files against the most recently finished images, read once.
+    # Fall back to the metadata in the images themselves if there is no
+    # manifest yet. Images that have been deleted are made again
+    manifest = _read_manifest(fig_dir)
+    if manifest is None:
+        manifest = _recently_saved(fig_dir)
+    saved = {last_modified for name, last_modified in manifest.items()
+             if os.path.exists(os.path.join(fig_dir, name))}
+    to_process = []
     for obj in page['Contents']:
-        already_saved = False
         last_modified = obj['LastModified']
         last_modified = dt.datetime.strftime(last_modified, "%d_%m_%y-%H:%M:%S")
         logging.debug(f"Checking file: {obj['Key']}")
@@ -257,34 +571,85 @@ def check_and_save_recent_files(bucket_name, prefix, fig_dir):
         if os.path.exists(os.path.join(fig_dir, last_modified + ".tmp")):
             logging.debug("File being processed, skipping")
             continue
-        tmp_file = open(os.path.join(fig_dir, last_modified + ".tmp"), 'w')
-        tmp_file.close()
-        # Check that file hasn't already been finished. Only check 
-        # 12 most recent files
-        check_itr = 0
-        all_imgs = os.listdir(fig_dir)
-        all_imgs.sort()
-        for img_saved in all_imgs[::-1]:
-            if '.png' not in img_saved:
-                continue
-            check_itr += 1
-            if check_itr > 12:
-                break
-            filepath = os.path.join(fig_dir, img_saved)
-            with Image.open(filepath) as target_img:
-                if target_img.text['last_modified'] == last_modified:
-                    logging.debug(f"File already processed. Skipping.")
-                    already_saved = True
-        if not already_saved:
-            img, filename = process_s3_file(bucket_name, obj['Key'])
-            save_local(img, filename, fig_dir, last_modified)
-        os.remove(os.path.join(fig_dir, last_modified + ".tmp"))
+        if last_modified in saved:
+            logging.debug(f"File already processed. Skipping.")
+            continue
+        saved.add(last_modified)
+        to_process.append((obj['Key'], last_modified))
+
+    workers = min(PROCESS_WORKERS, len(to_process))
+    errors = []
+    if workers == 1:
+        # usually there is just one new file, which is not worth starting
+        # worker processes for, and this way the in-memory caches are kept
+        # for the next run
+        for key, last_modified in to_process:
+            _mark_in_progress(fig_dir, last_modified)
+            try:
+                _process_and_save(bucket_name, key, fig_dir, last_modified)
+            except Exception as e:
+                errors.append(e)
+    elif workers > 1:
+        # forkserver starts workers from a clean interpreter instead of
+        # forking this one, which is not safe with numba's thread pool
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context('forkserver'),
+                initializer=_init_worker,
+                initargs=(logging.getLogger().level, workers)) as exc:
+            futs = []
+            for key, last_modified in to_process:
+                _mark_in_progress(fig_dir, last_modified)
+                futs.append(exc.submit(_process_and_save, bucket_name, key,
+                                       fig_dir, last_modified))
+            for fut, (key, last_modified) in zip(futs, to_process):
+                if fut.exception() is None:
+                    continue
+                errors.append(fut.exception())
+                # a worker that died never got to remove its marker
+                marker = os.path.join(fig_dir, last_modified + ".tmp")
+                if os.path.exists(marker):
+                    logging.error('Failed to process %s', key,
+                                  exc_info=fut.exception())
+                    os.remove(marker)
+    # each failure has already been logged by _process_and_save
+    if errors:
+        raise errors[0]
     logging.debug("=== Run finished ===")
 
 
+def _mark_in_progress(fig_dir, last_modified):
+    # other runs skip the file while this marker exists, it is removed by
+    # _process_and_save once the file is done
+    tmp_file = open(os.path.join(fig_dir, last_modified + ".tmp"), 'w')
+    tmp_file.close()
+
+
+def _init_worker(log_level, workers):
+    # configure logging (and sentry) the same way as in the parent process
+    basic_logging_config()
+    logging.getLogger().setLevel(log_level)
+    # share the cores between the workers rather than every worker's
+    # kernels using all of them
+    numba.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+
+def _process_and_save(bucket_name, key, fig_dir, last_modified):
+    try:
+        img, filename = process_s3_file(bucket_name, key)
+        save_local(img, filename, fig_dir, last_modified)
+    except Exception:
+        logging.exception('Failed to process %s', key)
+        raise
+    finally:
+        os.remove(os.path.join(fig_dir, last_modified + ".tmp"))
+
+
 def remove_old_files(save_directory, keep_from=24):
     latest = dt.datetime.now() - dt.timedelta(hours=keep_from)
-    for file_ in save_directory.glob('*.png'):
+    for file_ in save_directory.iterdir():
+        if file_.suffix not in ('.png', '.webp'):
+            continue
         try:
             if '_' not in file_.stem:
                 raise ValueError
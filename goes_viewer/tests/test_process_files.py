@@ -0,0 +1,233 @@
+import json
+
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+import numpy as np
+import pyresample
+import pyresample.bilinear
+import pytest
+import xarray as xr
+
+
+from goes_viewer import process_files
+
+
+G17_PROJ4 = {
+    "ellps": "WGS84",
+    "a": 6378137.0,
+    "b": 6356752.31414,
+    "rf": 298.2572221,
+    "proj": "geos",
+    "lon_0": -137.0,
+    "lat_0": 0.0,
+    "h": 35786023.0,
+    "x_0": 0,
+    "y_0": 0,
+    "units": "m",
+    "sweep": "x",
+}
+
+
+@pytest.fixture()
+def goes_grid():
+    # a GOES-17 like grid, in meters, covering the image area
+    x = np.arange(1.6e6, 3.1e6, 2004.0)
+    y = np.arange(3.8e6, 2.9e6, -2004.0)
+    return xr.Dataset(coords={"x": x, "y": y}).assign_attrs(
+        platform_ID="G17", proj4_params=G17_PROJ4)
+
+
+@pytest.fixture()
+def channels():
+    rng = np.random.default_rng(0)
+    shape = (120, 160)
+    ds = xr.Dataset({
+        band: (("y", "x"),
+               rng.uniform(-0.1, 1.2, shape).astype(np.float32))
+        for band in ("CMI_C01", "CMI_C02", "CMI_C03")
+    })
+    ds["CMI_C13"] = (("y", "x"),
+                     rng.uniform(180, 320, shape).astype(np.float32))
+    ds["max_brightness_temperature_C13"] = xr.DataArray(
+        np.float32(300),
+        attrs={"valid_range": np.array([150, 350], dtype=np.float32)})
+    ds["CMI_C02"][5, 5] = np.nan
+    ds["CMI_C13"][7, 7] = np.nan
+    return ds
+
+
+def numpy_geocolor(ds):
+    R = np.clip(ds["CMI_C02"].data, 0, 1)
+    NIR = np.clip(ds["CMI_C03"].data, 0, 1)
+    B = np.clip(ds["CMI_C01"].data, 0, 1)
+    G = np.clip(0.45 * R + 0.1 * NIR + 0.45 * B, 0, 1)
+    R, G, B = (np.power(c, 1 / 1.7) for c in (R, G, B))
+    ir_range = ds.max_brightness_temperature_C13.valid_range
+    cleanIR = (ds["CMI_C13"].data - ir_range[0]) / (ir_range[1] - ir_range[0])
+    cleanIR = (1 - np.clip(cleanIR, 0, 1)) / 1.3
+    rgb = np.dstack([np.maximum(c, cleanIR) for c in (R, G, B)])
+    contrast = process_files.CONTRAST
+    F = (259 * (contrast + 255)) / (255.0 * 259 - contrast)
+    return np.clip(F * (rgb - 0.5) + 0.5, 0, 1)
+
+
+def test_make_geocolor_image(channels):
+    expected = numpy_geocolor(channels)
+    out = process_files.make_geocolor_image(channels)
+    assert out.shape == expected.shape
+    np.testing.assert_array_equal(np.isnan(out), np.isnan(expected))
+    assert np.nanmax(np.abs(out - expected)) < 1 / 255
+
+
+def test_resample_image(goes_grid, tmp_path, monkeypatch):
+    monkeypatch.setattr(process_files, "CACHE_DIR", str(tmp_path))
+    process_files._cached_resample_params.cache_clear()
+    params, shape = process_files.make_resample_params(goes_grid)
+
+    area_extent = (goes_grid.x.min().item(), goes_grid.y.min().item(),
+                   goes_grid.x.max().item(), goes_grid.y.max().item())
+    bil_info, ref_shape = process_files._compute_resample_params(
+        "G17", G17_PROJ4, len(goes_grid.x), len(goes_grid.y), area_extent)
+    assert shape == ref_shape
+
+    rng = np.random.default_rng(1)
+    img = rng.uniform(0, 1, (len(goes_grid.y), len(goes_grid.x), 3))
+    img[100:110, 200:210, 1] = np.nan
+    expected = np.dstack([
+        pyresample.bilinear.get_sample_from_bil_info(
+            img[..., i].reshape(-1), *bil_info, shape)
+        for i in range(3)
+    ])
+    missing = np.isnan(expected)
+    assert missing.any()
+    expected = (np.nan_to_num(expected) * 255).astype("uint8")
+
+    out = process_files.resample_image(params, shape, img)
+    assert out.shape == shape + (4,)
+    assert (out[..., 3] == 255).all()
+    assert (out[..., :3][missing] == 0).all()
+    diff = np.abs(out[..., :3].astype(int) - expected.astype(int))
+    assert diff.max() <= 1
+
+
+@pytest.mark.parametrize("coord,expected", [
+    (np.arange(0.0, 10.0), slice(3, 8)),
+    (np.arange(9.0, -1.0, -1.0), slice(2, 7)),
+])
+def test_bounds_slice(coord, expected):
+    sl = process_files._bounds_slice(coord, 2.5, 7.0)
+    assert sl == expected
+    assert coord[sl].min() >= 2.5
+    assert coord[sl].max() <= 7.0
+
+
+@pytest.mark.parametrize("coord", [
+    np.arange(0.0, 10.0),
+    np.arange(9.0, -1.0, -1.0),
+])
+def test_bounds_slice_outside(coord):
+    assert len(coord[process_files._bounds_slice(coord, 20.0, 30.0)]) == 0
+    assert len(coord[process_files._bounds_slice(coord, -5.0, 20.0)]) == 10
+
+
+@pytest.fixture()
+def fake_compute(monkeypatch, tmp_path):
+    monkeypatch.setattr(process_files, "CACHE_DIR", str(tmp_path))
+    process_files._cached_resample_params.cache_clear()
+    calls = []
+
+    def compute(platform_id, proj4_params, width, height, area_extent):
+        calls.append(platform_id)
+        bil_info = (np.array([0.5, 0.25]), np.array([0.5, 0.0]),
+                    np.ones(4, dtype=bool),
+                    np.asfortranarray([[0, 1, 2, 3], [3, 2, 1, 0]]))
+        return bil_info, (1, 2)
+
+    monkeypatch.setattr(process_files, "_compute_resample_params", compute)
+    yield calls
+    process_files._cached_resample_params.cache_clear()
+
+
+def _cached_params():
+    return process_files._cached_resample_params(
+        "G17", tuple(G17_PROJ4.items()), 2, 2, (0.0, 0.0, 1.0, 1.0))
+
+
+def test_cached_resample_params_round_trip(fake_compute, tmp_path):
+    (index, weights), shape = _cached_params()
+    assert fake_compute == ["G17"]
+    assert shape == (1, 2)
+    assert index.flags.c_contiguous
+    assert index.dtype == np.int64
+    assert weights.dtype == np.float32
+    np.testing.assert_allclose(weights.sum(axis=1), 1)
+    assert len(list(tmp_path.glob("bil_G17_*.npz"))) == 1
+
+    process_files._cached_resample_params.cache_clear()
+    (cindex, cweights), cshape = _cached_params()
+    assert fake_compute == ["G17"]
+    assert cshape == shape
+    assert cindex.flags.c_contiguous
+    np.testing.assert_array_equal(cindex, index)
+    np.testing.assert_array_equal(cweights, weights)
+
+
+def test_cached_resample_params_corrupt(fake_compute, tmp_path):
+    _cached_params()
+    path, = tmp_path.glob("bil_G17_*.npz")
+    path.write_bytes(path.read_bytes()[:20])
+
+    process_files._cached_resample_params.cache_clear()
+    (index, weights), shape = _cached_params()
+    assert fake_compute == ["G17", "G17"]
+    assert shape == (1, 2)
+    assert index.shape == weights.shape == (2, 4)
+
+    process_files._cached_resample_params.cache_clear()
+    _cached_params()
+    assert fake_compute == ["G17", "G17"]
+
+
+def _save_png(fig_dir, name, last_modified):
+    info = PngInfo()
+    info.add_text("last_modified", last_modified)
+    Image.new("RGBA", (1, 1)).save(fig_dir / name, pnginfo=info)
+
+
+def _read_manifest_file(fig_dir):
+    return json.loads((fig_dir / process_files.MANIFEST).read_text())
+
+
+def test_update_manifest_seeds_from_images(tmp_path):
+    _save_png(tmp_path, "G17_2020-01-01T00:00:00Z.png", "a")
+    _save_png(tmp_path, "G16_2020-01-01T00:10:00Z.png", "b")
+    process_files._update_manifest(
+        tmp_path, "G17_2020-01-01T00:20:00Z.png", "c")
+    assert _read_manifest_file(tmp_path) == {
+        "G17_2020-01-01T00:00:00Z.png": "a",
+        "G16_2020-01-01T00:10:00Z.png": "b",
+        "G17_2020-01-01T00:20:00Z.png": "c",
+    }
+
+
+def test_update_manifest_keeps_newest_by_time(tmp_path):
+    names = ["G17_2020-01-01T00:00:00Z.png", "G16_2020-01-01T00:10:00Z.png",
+             "G17_2020-01-01T00:20:00Z.png", "G16_2020-01-01T00:30:00Z.png"]
+    for i, name in enumerate(names):
+        process_files._update_manifest(tmp_path, name, str(i), keep=2)
+    manifest = _read_manifest_file(tmp_path)
+    assert manifest == {names[2]: "2", names[3]: "3"}
+    assert process_files._read_manifest(tmp_path) == manifest
+
+
+def test_update_manifest_replaces_invalid(tmp_path):
+    _save_png(tmp_path, "G17_2020-01-01T00:00:00Z.png", "a")
+    (tmp_path / process_files.MANIFEST).write_text("{not json")
+    assert process_files._read_manifest(tmp_path) is None
+    process_files._update_manifest(
+        tmp_path, "G17_2020-01-01T00:10:00Z.png", "b")
+    assert _read_manifest_file(tmp_path) == {
+        "G17_2020-01-01T00:00:00Z.png": "a",
+        "G17_2020-01-01T00:10:00Z.png": "b",
+    }
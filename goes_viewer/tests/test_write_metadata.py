@@ -0,0 +1,29 @@
+import pytest
+
+
+from goes_viewer import write_metadata
+
+
+@pytest.fixture()
+def keep():
+    return write_metadata.make_filter(
+        {"site_type": ["power_plant", "weather_station"],
+         "provider": "UA SOLRMAP"})
+
+
+@pytest.mark.parametrize("item,expected", [
+    ({"site_type": "power_plant", "provider": "UA SOLRMAP"}, True),
+    ({"site_type": "weather_station", "provider": "UA SOLRMAP",
+      "name": "x"}, True),
+    ({"site_type": "other", "provider": "UA SOLRMAP"}, False),
+    # a single string is one value, not a set of characters
+    ({"site_type": "power_plant", "provider": "U"}, False),
+    ({"site_type": "power_plant"}, False),
+    ({}, False),
+])
+def test_make_filter(keep, item, expected):
+    assert keep(item) is expected
+
+
+def test_make_filter_empty():
+    assert write_metadata.make_filter({})({"anything": 1})
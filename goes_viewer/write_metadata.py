@@ -1,52 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 from functools import partial
-import json
 import logging
 from pathlib import Path
 import tempfile
 
 
-from pyproj import transform
+import numpy as np
 import pytz
 import requests
+from requests.adapters import HTTPAdapter
 
 
-from goes_viewer.constants import WEB_MERCATOR, GEODETIC
+from goes_viewer import fastjson
+from goes_viewer.constants import GEO_TO_WEB_MERCATOR
 
 
 logger = logging.getLogger(__name__)
+FETCH_WORKERS = 16
+# share connections between requests instead of a new handshake for each
+_SESSION = requests.Session()
+for _prefix in ('http://', 'https://'):
+    _SESSION.mount(_prefix, HTTPAdapter(pool_connections=32, pool_maxsize=32))
 
 
-def filter_func(filters, item):
-    for k, v in filters.items():
-        if k not in item:
-            return False
-        else:
-            if item[k] not in v:
+def make_filter(filters):
+    """
+    Function that is True for items where the value of every key in filters
+    is one of the allowed values. A single string is one allowed value.
+    """
+    allowed = [
+        (k, frozenset([v]) if isinstance(v, str) else frozenset(v))
+        for k, v in filters.items()
+    ]
+
+    def filter_func(item):
+        for k, v in allowed:
+            if k not in item or item[k] not in v:
                 return False
-    return True
+        return True
+
+    return filter_func
 
 
 def parse_metadata(url, filters, auth=(), params={}, timeout=None):
     req = requests.get(f'{url}/metadata', auth=auth, params=params,
                        timeout=timeout)
     req.raise_for_status()
+    keep = make_filter(filters)
     out = []
-    js = req.json()["Metadata"]
-    filtered = filter(partial(filter_func, filters), js)
-    for site in filtered:
-        pt = transform(GEODETIC,
-                       WEB_MERCATOR,
-                       site["Longitude"],
-                       site["Latitude"],
-                       always_xy=True)
+    lons = []
+    lats = []
+    for site in fastjson.loads(req.content)["Metadata"]:
+        if not keep(site):
+            continue
+        lons.append(site["Longitude"])
+        lats.append(site["Latitude"])
         out.append({
             "name": site["Name"],
-            "x": pt[0],
-            "y": pt[1],
+            "x": None,
+            "y": None,
             "units": site["Units"],
             "capacity": f"{site['Peak Power']:0.2f}"
         })
+    # transform all of the sites in one call
+    xs, ys = GEO_TO_WEB_MERCATOR.transform(np.array(lons, dtype=float),
+                                           np.array(lats, dtype=float))
+    for site, x, y in zip(out, xs.tolist(), ys.tolist()):
+        site["x"] = x
+        site["y"] = y
     return out
 
 
@@ -58,43 +80,47 @@ def get_latest_data(url, metadata_list, auth=(), params={},
     params['startat'] = now.strftime('%Y%m%dT%H%M%SZ')
     params['endat'] = now.strftime('%Y%m%dT%H%M%SZ')
     params['beforestart'] = True
-    out = []
-    for out_dict in metadata_list:
-        sp = params.copy()
-        sp['id'] = out_dict['name']
-        req = requests.get(f'{url}/data', auth=auth, params=sp,
-                           timeout=timeout)
-        req.raise_for_status()
-        otime = 'N/A'
-        oval = 'N/A'
-        try:
-            data = req.json()['Data'][0]
-        except IndexError:
-            logger.info('No data for %s', out_dict['name'])
-        else:
-            dtime = dt.datetime.strptime(
-                data['BeginAt'],
-                '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=pytz.utc).astimezone(
-                    pytz.timezone('MST'))
-            # only if the value is from the past hour, or from the past day and also
-            # zero do we include
-            if dtime > now - dt.timedelta(hours=1) or (
-                    dtime > now - dt.timedelta(days=1)
-                    and float(data['Value']) < 1e-6):
-                otime = dtime.strftime('%Y-%m-%d %H:%M:%S MST')
-                oval = f"{data['Value']:0.2f}"
-        finally:
-            out_dict['last_time'] = otime
-            out_dict['last_value'] = oval
-        out.append(out_dict)
+    fetch = partial(_fetch_one, url, now, auth=auth, params=params,
+                    timeout=timeout)
+    with ThreadPoolExecutor(FETCH_WORKERS) as exc:
+        out = list(exc.map(fetch, metadata_list))
     logger.info('Done updating data')
     return out
 
 
+def _fetch_one(url, now, out_dict, auth=(), params={}, timeout=None):
+    sp = params.copy()
+    sp['id'] = out_dict['name']
+    req = _SESSION.get(f'{url}/data', auth=auth, params=sp, timeout=timeout)
+    req.raise_for_status()
+    otime = 'N/A'
+    oval = 'N/A'
+    try:
+        data = fastjson.loads(req.content)['Data'][0]
+    except IndexError:
+        logger.info('No data for %s', out_dict['name'])
+    else:
+        dtime = dt.datetime.strptime(
+            data['BeginAt'],
+            '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=pytz.utc).astimezone(
+                pytz.timezone('MST'))
+        # only if the value is from the past hour, or from the past day and also
+        # zero do we include
+        if dtime > now - dt.timedelta(hours=1) or (
+                dtime > now - dt.timedelta(days=1)
+                and float(data['Value']) < 1e-6):
+            otime = dtime.strftime('%Y-%m-%d %H:%M:%S MST')
+            oval = f"{data['Value']:0.2f}"
+    finally:
+        out_dict['last_time'] = otime
+        out_dict['last_value'] = oval
+    return out_dict
+
+
 def update_existing_file(metadata_file, base_url, auth, params, timeout):
     logger.info('Updating values in metadata file')
     with open(metadata_file, 'r') as f:
-        meta = json.load(f)
+        meta = fastjson.loads(f.read())
 
     out = get_latest_data(base_url, meta, auth=auth,
                           params=params, timeout=timeout)
@@ -102,7 +128,7 @@ def update_existing_file(metadata_file, base_url, auth, params, timeout):
     try:
         p = Path(tmpfile)
         with open(p, "w") as f:
-            json.dump(out, f)
+            f.write(fastjson.dumps(out))
     except Exception:
         p.unlink()
         raise ()
@@ -8,7 +8,7 @@ setup(
     author='Antonio Lorenzo',
     author_email='atlorenzo@email.arizona.edu',
     license='MIT',
-    packages=find_packages(),
+    packages=find_packages(exclude=['goes_viewer.tests']),
     include_package_data=True,
     zip_safe=True,
     version=versioneer.get_version(),